@@ -10,9 +10,10 @@ Responsável por toda a interação com o banco de dados PostgreSQL, incluindo:
 """
 
 import os
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import URL
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker, Session, joinedload
 import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
@@ -41,9 +42,10 @@ ENGINE = create_engine(
     DATABASE_URL,
     echo=False,          # Se True, imprime todos os SQLs executados.
     pool_pre_ping=True,  # Testa a validade das conexões antes de usá-las.
-    pool_size=5,         # Número de conexões mantidas no pool.
-    max_overflow=10,     # Conexões extras permitidas em picos de uso.
-    pool_recycle=1800,   # Recicla conexões após 30 minutos (1800s).
+    pool_size=20,        # Número de conexões mantidas no pool.
+    max_overflow=20,     # Conexões extras permitidas em picos de uso.
+    pool_timeout=30,     # Espera máxima (s) por uma conexão livre antes de falhar.
+    pool_recycle=3600,   # Recicla conexões após 1 hora (3600s).
     connect_args={"sslmode": DB_SSLMODE}, # Passa argumentos específicos do driver.
 )
 
@@ -137,12 +139,12 @@ def test_connection() -> bool:
 
 # --- Funções de Operações no Banco (CRUD) ---
 
-def get_all_researchers(db: Session) -> List[Researcher]:
-    """Retorna todos os pesquisadores, com seus experimentos já carregados (eager loading)."""
+def get_researchers_summary(db: Session) -> List[Tuple[int, str, Optional[int]]]:
+    """Retorna apenas (id, nome, elab_item_id) de cada pesquisador, ordenados por nome."""
     try:
-        return db.query(Researcher).options(joinedload(Researcher.experiments)).order_by(Researcher.name).all()
+        return db.query(Researcher.id, Researcher.name, Researcher.elab_item_id).order_by(Researcher.name).all()
     except Exception as e:
-        print(f"❌ Erro ao buscar todos os pesquisadores: {e}")
+        print(f"❌ Erro ao buscar o resumo dos pesquisadores: {e}")
         return []
 
 def get_all_experiments(db: Session) -> List[Experiment]:
@@ -157,36 +159,47 @@ def register_researcher(db: Session, name: str, password: str, elab_item_id: Opt
     """
     Registra um novo pesquisador ou atualiza um existente.
 
-    Se um pesquisador com o mesmo nome já existe, atualiza seu `elab_item_id` se
-    necessário e retorna o objeto completo. Caso contrário, cria um novo registro.
+    Tenta inserir diretamente: a restrição UNIQUE em `name` garante, de forma atômica,
+    que não haja duplicatas (sem o SELECT prévio, que ainda deixava uma janela para
+    cadastros simultâneos). Se o nome já existe, atualiza seu `elab_item_id` se
+    necessário e retorna o objeto completo.
 
     Returns:
         O objeto Researcher criado ou encontrado, com seus experimentos carregados.
     """
     try:
-        existing_researcher = db.query(Researcher).filter(Researcher.name == name).first()
-        
-        if existing_researcher:
-            # Se o pesquisador já existe, apenas atualiza o ID do eLab se estiver faltando.
-            if elab_item_id and not existing_researcher.elab_item_id:
-                existing_researcher.elab_item_id = elab_item_id
-                db.commit()
-            
-            # Recarrega o pesquisador forçando o carregamento dos experimentos.
-            # Isso garante que a resposta da API seja sempre completa e consistente.
-            complete_researcher = db.query(Researcher).options(
-                joinedload(Researcher.experiments)
-            ).filter(Researcher.id == existing_researcher.id).first()
-            return complete_researcher
-
-        # Se não existe, cria um novo pesquisador.
         new_researcher = Researcher(name=name, password=password, elab_item_id=elab_item_id)
         db.add(new_researcher)
         db.commit()
         db.refresh(new_researcher) # Atualiza o objeto com os dados do banco (como o ID gerado).
         print(f"✅ Pesquisador '{name}' criado com ID local {new_researcher.id}")
         return new_researcher
-        
+    except IntegrityError:
+        db.rollback() # O nome já existe: segue para a atualização do registro existente.
+    except Exception as e:
+        db.rollback() # Desfaz a transação em caso de erro.
+        print(f"❌ Erro ao registrar pesquisador: {e}")
+        return None
+
+    try:
+        existing_researcher = db.query(Researcher).filter(Researcher.name == name).first()
+        if not existing_researcher:
+            # A violação veio de outra restrição (ex.: `elab_item_id` já vinculado).
+            print(f"❌ Erro ao registrar pesquisador: violação de integridade para '{name}'.")
+            return None
+
+        # Se o pesquisador já existe, apenas atualiza o ID do eLab se estiver faltando.
+        if elab_item_id and not existing_researcher.elab_item_id:
+            existing_researcher.elab_item_id = elab_item_id
+            db.commit()
+
+        # Recarrega o pesquisador forçando o carregamento dos experimentos.
+        # Isso garante que a resposta da API seja sempre completa e consistente.
+        complete_researcher = db.query(Researcher).options(
+            joinedload(Researcher.experiments)
+        ).filter(Researcher.id == existing_researcher.id).first()
+        return complete_researcher
+
     except Exception as e:
         db.rollback() # Desfaz a transação em caso de erro.
         print(f"❌ Erro ao registrar pesquisador: {e}")
@@ -196,11 +209,13 @@ def register_experiment(db: Session, agendamento_id: str, elab_experiment_id: in
     """Registra um novo experimento no banco de dados local."""
     try:
         # Verifica se o experimento já foi registrado para evitar duplicatas.
-        if db.query(Experiment).filter(Experiment.id == agendamento_id).first():
+        # `db.get` busca pela chave primária e consulta primeiro o identity map
+        # da sessão: objetos já carregados na requisição não geram novo SELECT.
+        if db.get(Experiment, agendamento_id):
             print(f"ℹ️ Experimento '{agendamento_id}' já registrado.")
             return True
         # Garante que o pesquisador associado existe.
-        if not db.query(Researcher).filter(Researcher.id == researcher_local_id).first():
+        if not db.get(Researcher, researcher_local_id):
             print(f"❌ Falha ao registrar experimento: Pesquisador com ID local {researcher_local_id} não encontrado.")
             return False
             
@@ -8,15 +8,23 @@ abstraindo os detalhes das requisições HTTP. As outras partes do backend
 operações no eLab, garantindo um ponto único de manutenção e controle.
 """
 
+import functools
 import re
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # --- Constantes de Configuração ---
 
 # Tempo máximo de espera (em segundos) para as requisições à API.
 TIMEOUT = 30
 
+# Quantidade máxima de bytes do corpo de uma resposta de erro incluída na mensagem da exceção.
+MAX_ERROR_BYTES = 600
+
 # Título do "Tipo de Item" no eLabFTW que será usado para categorizar os pesquisadores.
 # Este tipo será criado caso não exista.
 ITEM_TYPE_TITLE = "Pesquisador"
@@ -29,16 +37,138 @@ TEMPLATE_TITLE_TO_FIND = "Análise Clínica teste"
 # encontrado, este será utilizado para evitar a interrupção total do serviço.
 FALLBACK_TEMPLATE_ID = 1
 
+# Intervalo inicial (em segundos) entre consultas ao eLabFTW ao acompanhar o status de um
+# experimento. Enquanto o status não muda, o intervalo dobra até `MAX_STATUS_POLL_INTERVAL`.
+STATUS_POLL_INTERVAL = 30
+MAX_STATUS_POLL_INTERVAL = 300
+
+# Tamanho dos blocos (em bytes) repassados ao cliente ao exportar um PDF.
+PDF_CHUNK_SIZE = 64 * 1024
+
+# Status a partir dos quais o experimento não muda mais ("Concluída", "Requer reavaliação", "Falhou").
+TERMINAL_STATUSES = frozenset({"2", "3", "4"})
+
+
+# Tempo (em segundos) que o ID do tipo "Pesquisador" e o template ficam em cache.
+# Esses recursos quase nunca mudam no eLabFTW.
+LOOKUP_CACHE_TTL = 300
+
+# Tempo (em segundos) que um status consultado é reaproveitado. Curto o bastante para
+# não atrasar mudanças, mas absorve rajadas de consultas ao mesmo experimento.
+STATUS_CACHE_TTL = 5
+
+# Tempo (em segundos) durante o qual uma instância que recusou `body` na criação do
+# experimento usa diretamente a criação seguida de PATCH, antes de testar de novo.
+BODY_ON_CREATE_RETRY = 600
+
+
+# --- Erros ---
+
+class ElabAPIError(RuntimeError):
+    """Resposta de erro da API do eLabFTW. Guarda o status HTTP para quem precisar distingui-lo."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# --- Sessão HTTP Compartilhada ---
+
+# Uma única sessão por processo mantém as conexões com o eLabFTW abertas
+# (keep-alive), evitando um novo handshake TCP/TLS a cada chamada.
+# Falhas transitórias (conexão, 429, 5xx) são repetidas com backoff, respeitando
+# o `Retry-After` do servidor. Apenas GET: repetir um POST poderia duplicar itens no eLab.
+SESSION = requests.Session()
+# O intervalo cresce exponencialmente (0,5s, 1s, 2s, ... até 10s) com um jitter aleatório
+# que evita que vários workers repitam a chamada no mesmo instante.
+_retry = Retry(
+    total=4,
+    backoff_factor=0.5,
+    backoff_max=10,
+    backoff_jitter=0.25,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=100, max_retries=_retry)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+
+# ID numérico no final do cabeçalho `Location` devolvido na criação de recursos.
+_LOCATION_ID_RE = re.compile(r"/(\d+)$")
+
+# Variáveis do template no formato `{{nome}}`.
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+# Momento (`time.monotonic()`) em que cada instância do eLab (por URL base) recusou `body`
+# no POST de criação do experimento. Ausente = aceita (ou ainda não testado). A recusa só
+# vale por `BODY_ON_CREATE_RETRY` segundos: um 400/422 pode ter outra causa (título inválido,
+# rejeição transitória), então a criação com corpo volta a ser testada depois disso.
+_BODY_REFUSED_AT: Dict[str, float] = {}
+
+
+# Último ETag e payload recebidos por (URL base, chave, caminho, parâmetros) em GETs.
+_ETAG_CACHE: Dict[tuple, Tuple[str, Any]] = {}
+ETAG_CACHE_SIZE = 1024
+
+
+# Se cada instância do eLab (por URL base) espera o ID do item no caminho do endpoint
+# de vínculo (`items_links/{id}`) ou no corpo. Ausente = ainda não descoberto.
+_LINK_ID_IN_PATH: Dict[str, bool] = {}
+
+
+# --- Cache em Memória ---
+
+def _ttl_cache(ttl: float, maxsize: int = 1024) -> Callable:
+    """
+    Memoriza o resultado de uma função por `ttl` segundos, por combinação de argumentos.
+    Os argumentos incluem a URL e a chave da API, então instâncias do eLab não se misturam.
+    Exceções não são guardadas. `cache_clear()` descarta todas as entradas.
+    Ao atingir `maxsize` entradas, as expiradas são removidas (ou todas, se nenhuma expirou).
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: Dict[tuple, Tuple[float, Any]] = {}
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            hit = cache.get(args)
+            if hit is not None and now - hit[0] < ttl:
+                return hit[1]
+            value = func(*args)
+            if len(cache) >= maxsize:
+                for stale in [k for k, (stamp, _) in list(cache.items()) if now - stamp >= ttl]:
+                    cache.pop(stale, None)
+                if len(cache) >= maxsize:
+                    cache.clear()
+            cache[args] = (now, value)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
 
 # --- Funções Auxiliares de Requisição ---
 
 def _url(base: str, path: str) -> str:
-    """Constrói a URL completa para um endpoint da API, tratando barras."""
-    return f"{base.rstrip('/')}/{path.lstrip('/')}"
+    """
+    Constrói a URL completa para um endpoint da API, tratando barras.
+    No caso comum (base sem barra final, caminho sem barra inicial) não cria cópias intermediárias.
+    """
+    if base.endswith("/"):
+        base = base.rstrip("/")
+    if path.startswith("/"):
+        path = path.lstrip("/")
+    return f"{base}/{path}"
 
 def _req(
     base: str, api_key: str, verify_tls: bool, method: str,
-    path: str, json_body: Optional[Dict] = None, params: Optional[Dict] = None
+    path: str, json_body: Optional[Dict] = None, params: Optional[Dict] = None,
+    stream: bool = False, extra_headers: Optional[Dict[str, str]] = None,
 ) -> requests.Response:
     """
     Função central para executar requisições HTTP para a API do eLabFTW.
@@ -51,41 +181,74 @@ def _req(
         path: Caminho do endpoint (ex: '/api/v2/experiments').
         json_body: Corpo da requisição em formato de dicionário.
         params: Parâmetros de query da URL.
+        stream: Se True, o corpo não é baixado de imediato (leitura via `iter_content`).
+        extra_headers: Cabeçalhos adicionais (ex: `If-None-Match`).
 
     Returns:
         O objeto de resposta da requisição.
 
     Raises:
-        RuntimeError: Se a resposta da API indicar um erro (status code não for 2xx).
+        ElabAPIError: Se a resposta da API indicar um erro (status code não for 2xx).
     """
     headers = {
         "Authorization": api_key,
         "Accept": "application/json",
         "Content-Type": "application/json",
     }
-    response = requests.request(
+    if extra_headers:
+        headers.update(extra_headers)
+    response = SESSION.request(
         method=method.upper(),
         url=_url(base, path),
         headers=headers,
-        json=json_body,
+        data=orjson.dumps(json_body) if json_body is not None else None,
         params=params,
         timeout=TIMEOUT,
         verify=verify_tls,
+        stream=stream,
     )
 
     # Lança uma exceção com detalhes se a requisição falhar.
-    if response.status_code not in (200, 201, 204):
-        error_msg = response.text or f"status={response.status_code}"
-        if len(error_msg) > 600:
-            error_msg = error_msg[:600] + "... (truncado)"
-        raise RuntimeError(f"{method.upper()} {path} -> {response.status_code}: {error_msg}")
+    # 304 (Not Modified) só ocorre em GETs condicionais e é tratado por quem os envia.
+    if response.status_code not in (200, 201, 204, 304):
+        # Lê no máximo MAX_ERROR_BYTES (+1 para saber se há mais) e decodifica só esse trecho,
+        # sem baixar nem decodificar inteiras páginas de erro grandes de proxies.
+        raw = next(response.iter_content(chunk_size=MAX_ERROR_BYTES + 1), b"")
+        response.close()
+        error_msg = raw[:MAX_ERROR_BYTES].decode(response.encoding or "utf-8", errors="replace")
+        if len(raw) > MAX_ERROR_BYTES:
+            error_msg += "... (truncado)"
+        error_msg = error_msg or f"status={response.status_code}"
+        raise ElabAPIError(response.status_code, f"{method.upper()} {path} -> {response.status_code}: {error_msg}")
 
     return response
 
 # Funções "wrapper" para os métodos HTTP mais comuns, simplificando as chamadas.
 def GET(base, key, verify, path, params=None) -> Any:
-    """Executa uma requisição GET e retorna a resposta JSON decodificada."""
-    return _req(base, key, verify, "GET", path, params=params).json()
+    """
+    Executa uma requisição GET e retorna a resposta JSON decodificada.
+
+    Se o eLab enviou um `ETag` para o mesmo recurso antes, a requisição é condicional
+    (`If-None-Match`); um 304 reaproveita o payload já decodificado, sem corpo nem parse.
+    """
+    cache_key = (base, key, path, tuple(sorted(params.items())) if params else ())
+    cached = _ETAG_CACHE.get(cache_key)
+    extra_headers = {"If-None-Match": cached[0]} if cached else None
+
+    response = _req(base, key, verify, "GET", path, params=params, extra_headers=extra_headers)
+    if response.status_code == 304 and cached:
+        return cached[1]
+    # 204 (No Content) ou corpo vazio: nada a decodificar nem a guardar no cache de ETag.
+    if response.status_code == 204 or not response.content:
+        return {}
+
+    data = orjson.loads(response.content)
+    etag = response.headers.get("ETag")
+    if etag:
+        if len(_ETAG_CACHE) >= ETAG_CACHE_SIZE:
+            _ETAG_CACHE.clear()
+        _ETAG_CACHE[cache_key] = (etag, data)
+    return data
 
 def POST(base, key, verify, path, body=None) -> requests.Response:
     """Executa uma requisição POST e retorna o objeto de resposta completo."""
@@ -95,18 +258,45 @@ def PATCH(base, key, verify, path, body=None) -> None:
     """Executa uma requisição PATCH. Não retorna conteúdo."""
     _req(base, key, verify, "PATCH", path, json_body=body or {})
 
+# Chaves comuns em APIs para listas de resultados.
+_LIST_KEYS = ("items", "data", "results")
+
 def _to_list(data: Any) -> list:
     """
     Normaliza a resposta da API para sempre retornar uma lista.
     APIs paginadas frequentemente retornam um dicionário com uma chave como 'items' ou 'data'.
     """
+    # A API v2 do eLabFTW devolve listas diretamente: é o caso mais comum, testado primeiro.
+    if isinstance(data, list):
+        return data
     if isinstance(data, dict):
-        # Chaves comuns em APIs para listas de resultados.
-        for key in ("items", "data", "results"):
-            if isinstance(data.get(key), list):
-                return data[key]
+        for key in _LIST_KEYS:
+            value = data.get(key)
+            if isinstance(value, list):
+                return value
+    return []
+
+def _search_by_title(base: str, key: str, verify: bool, path: str, title: str) -> list:
+    """
+    Lista um recurso filtrando no servidor pelo parâmetro de busca `q`, o que reduz o
+    payload a poucas entradas. Devolve lista vazia se a instância recusar o filtro
+    (400/404/422), para que o chamador recorra à listagem completa; demais erros
+    (autenticação, 5xx) sobem, pois a listagem completa falharia do mesmo jeito.
+    """
+    try:
+        return _to_list(GET(base, key, verify, path, params={"q": title.strip()}))
+    except ElabAPIError as e:
+        if e.status_code not in (400, 404, 422):
+            raise
         return []
-    return data if isinstance(data, list) else []
+
+def _find_by_title(rows: list, title: str) -> Optional[Dict[str, Any]]:
+    """Devolve a primeira entrada cujo título coincide (sem diferenciar maiúsculas), ou None."""
+    wanted = title.strip().lower()
+    for row in rows:
+        if (row.get("title") or "").strip().lower() == wanted:
+            return row
+    return None
 
 def _find_id_from_response(response: requests.Response, base_url: str, api_key: str, verify_tls: bool, title_to_search: str) -> int:
     """
@@ -120,16 +310,16 @@ def _find_id_from_response(response: requests.Response, base_url: str, api_key:
     # Tentativa 1: ID no corpo da resposta.
     if response.content:
         try:
-            data = response.json()
+            data = orjson.loads(response.content)
             if isinstance(data, dict) and isinstance(data.get("id"), int):
                 return data["id"]
-        except requests.exceptions.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass  # Se não for JSON, prossegue para a próxima tentativa.
 
     # Tentativa 2: ID no cabeçalho 'Location'.
     location_header = response.headers.get("Location") or response.headers.get("location")
     if location_header:
-        match = re.search(r"/(\d+)$", location_header)
+        match = _LOCATION_ID_RE.search(location_header)
         if match:
             return int(match.group(1))
 
@@ -149,6 +339,7 @@ def _find_id_from_response(response: requests.Response, base_url: str, api_key:
 
 # --- Lógica de Negócio Específica do eLabFTW ---
 
+@_ttl_cache(LOOKUP_CACHE_TTL)
 def get_template_object_by_title(base: str, key: str, verify: bool, title: str) -> Dict[str, Any]:
     """
     Busca um template mestre pelo título.
@@ -163,23 +354,22 @@ def get_template_object_by_title(base: str, key: str, verify: bool, title: str)
         RuntimeError: Se nem o template principal nem o de fallback forem encontrados.
     """
     try:
+        # Primeiro pede ao servidor só os templates que casam com o título.
+        found_template = _find_by_title(_search_by_title(base, key, verify, "experiments_templates", title), title)
+        if found_template:
+            return found_template
+
         all_templates_data = GET(base, key, verify, "experiments_templates")
         all_templates = _to_list(all_templates_data)
 
-        found_template = None
-        fallback_template = None
-
-        for template in all_templates:
-            # Compara o título principal (case-insensitive).
-            if (template.get("title") or "").strip().lower() == title.strip().lower():
-                found_template = template
-            # Procura pelo template de fallback para tê-lo como garantia.
-            if str(template.get("id")) == str(FALLBACK_TEMPLATE_ID):
-                fallback_template = template
-
+        # Compara o título principal (case-insensitive); o título alvo é normalizado uma única vez.
+        found_template = _find_by_title(all_templates, title)
         if found_template:
             return found_template
-        
+
+        # Só então procura o template de fallback.
+        fallback_id = str(FALLBACK_TEMPLATE_ID)
+        fallback_template = next((t for t in all_templates if str(t.get("id")) == fallback_id), None)
         if fallback_template:
             print(f"AVISO: Template '{title}' não encontrado. Usando fallback ID {FALLBACK_TEMPLATE_ID}.")
             return fallback_template
@@ -188,6 +378,7 @@ def get_template_object_by_title(base: str, key: str, verify: bool, title: str)
     except Exception as e:
         raise RuntimeError(f"Falha ao buscar a lista de templates da API: {e}")
 
+@_ttl_cache(LOOKUP_CACHE_TTL)
 def ensure_item_type_researcher(base: str, key: str, verify: bool) -> int:
     """
     Garante que o tipo de item 'Pesquisador' exista no eLabFTW.
@@ -195,10 +386,13 @@ def ensure_item_type_researcher(base: str, key: str, verify: bool) -> int:
     Se não existir, cria o tipo e retorna seu ID. Caso contrário, apenas retorna o ID existente.
     Isso torna a aplicação autoconfigurável na primeira execução.
     """
-    all_types = GET(base, key, verify, "items_types")
-    for item_type in _to_list(all_types):
-        if (item_type.get("title") or "").strip().lower() == ITEM_TYPE_TITLE.lower():
-            return int(item_type["id"])
+    # Primeiro pede ao servidor só os tipos que casam com o título; se nada vier
+    # (filtro não suportado ou tipo inexistente), confere a lista completa.
+    item_type = _find_by_title(_search_by_title(base, key, verify, "items_types", ITEM_TYPE_TITLE), ITEM_TYPE_TITLE)
+    if item_type is None:
+        item_type = _find_by_title(_to_list(GET(base, key, verify, "items_types")), ITEM_TYPE_TITLE)
+    if item_type is not None:
+        return int(item_type["id"])
     
     # Se o loop terminar sem encontrar, cria o novo tipo.
     print(f"Criando tipo de item '{ITEM_TYPE_TITLE}' no eLabFTW...")
@@ -230,10 +424,12 @@ def create_experiment(base: str, key: str, verify: bool, title: str, vars_dict:
     Cria um novo experimento no eLabFTW a partir de um template.
 
     O processo envolve:
-    1. Encontrar o ID do template pelo título.
-    2. Criar um experimento vazio para obter um ID.
-    3. Preencher as variáveis do corpo do template (ex: `{{data_coleta}}`).
-    4. Atualizar (PATCH) o experimento com o corpo preenchido.
+    1. Encontrar o template pelo título.
+    2. Preencher as variáveis do corpo do template (ex: `{{data_coleta}}`).
+    3. Criar o experimento já com o corpo preenchido, numa única requisição.
+       Se a instância recusar `body` na criação, cria o experimento vazio e o
+       atualiza (PATCH) em seguida; a recusa fica memorizada por instância durante
+       `BODY_ON_CREATE_RETRY` segundos.
 
     Returns:
         O ID do experimento recém-criado.
@@ -247,16 +443,32 @@ def create_experiment(base: str, key: str, verify: bool, title: str, vars_dict:
     if not template_body:
         raise RuntimeError(f"O template '{template_object.get('title')}' está com o corpo vazio.")
 
-    # 2. Criar o experimento vazio para reservar um ID.
+    # 2. Substituir as variáveis no corpo do template, numa única passada.
+    # Placeholders sem valor correspondente permanecem intactos.
+    values = vars_dict or {}
+    body = _PLACEHOLDER_RE.sub(
+        lambda m: str(values[m.group(1)]) if m.group(1) in values else m.group(0),
+        template_body,
+    )
+
+    # 3. Criar o experimento com o conteúdo.
+    refused_at = _BODY_REFUSED_AT.get(base)
+    if refused_at is None or time.monotonic() - refused_at >= BODY_ON_CREATE_RETRY:
+        try:
+            response_obj = POST(base, key, verify, "experiments", {"title": title.strip(), "body": body})
+        except ElabAPIError as e:
+            # Só uma recusa do conteúdo (400/422) indica falta de suporte a `body` e garante
+            # que nada foi criado; demais erros (autenticação, 5xx) sobem normalmente.
+            if e.status_code not in (400, 422):
+                raise
+            print(f"Alerta: criação com corpo recusada ({e}). Usando criação seguida de PATCH.")
+            _BODY_REFUSED_AT[base] = time.monotonic()
+        else:
+            _BODY_REFUSED_AT.pop(base, None)
+            return _find_id_from_response(response_obj, base, key, verify, title)
+
     response_obj = POST(base, key, verify, "experiments", {"title": title.strip()})
     exp_id = _find_id_from_response(response_obj, base, key, verify, title)
-
-    # 3. Substituir as variáveis no corpo do template.
-    body = template_body
-    for placeholder, value in (vars_dict or {}).items():
-        body = body.replace(f"{{{{{placeholder}}}}}", str(value))
-    
-    # 4. Atualizar o experimento com o conteúdo.
     PATCH(base, key, verify, f"experiments/{exp_id}", {"body": body})
     return exp_id
 
@@ -265,36 +477,62 @@ def link_experiment_to_item(base: str, key: str, verify: bool, exp_id: int, item
     if not all([isinstance(exp_id, int), isinstance(item_id, int)]):
         raise TypeError("IDs do experimento e do item devem ser inteiros.")
     
-    # A API do eLab pode ter variações no endpoint de vínculo.
-    # Tenta o método mais comum primeiro.
+    # A API do eLab pode ter variações no endpoint de vínculo: o ID do item no caminho
+    # (mais comum) ou no corpo. A variante que funcionou fica memorizada por instância.
+    def post_link(id_in_path: bool):
+        if id_in_path:
+            POST(base, key, verify, f"experiments/{exp_id}/items_links/{item_id}", {})
+        else:
+            POST(base, key, verify, f"experiments/{exp_id}/items_links", {"id": item_id})
+
+    id_in_path = _LINK_ID_IN_PATH.get(base, True)
     try:
-        POST(base, key, verify, f"experiments/{exp_id}/items_links/{item_id}", {})
-    except Exception as e:
-        # Se falhar, tenta um método alternativo que algumas versões da API usam.
-        print(f"Alerta: O link direto falhou ({e}). Tentando método alternativo.")
-        POST(base, key, verify, f"experiments/{exp_id}/items_links", {"id": item_id})
+        post_link(id_in_path)
+    except ElabAPIError as e:
+        # Só um endpoint inexistente (404/405) justifica a outra variante; falhas de rede,
+        # autenticação ou do servidor sobem sem gastar uma segunda chamada.
+        if e.status_code not in (404, 405):
+            raise
+        print(f"Alerta: O endpoint de vínculo falhou ({e}). Tentando método alternativo.")
+        id_in_path = not id_in_path
+        post_link(id_in_path)
+    _LINK_ID_IN_PATH[base] = id_in_path
+
+@_ttl_cache(STATUS_CACHE_TTL)
+def get_status_info(base: str, key: str, verify: bool, exp_id: int) -> Dict[str, Any]:
+    """
+    Busca o status atual de um experimento e a data da sua última modificação.
+    `modified_at` identifica a versão do conteúdo (útil para cache de PDFs).
+    """
+    exp = GET(base, key, verify, f"experiments/{exp_id}")
+    # Retorna o status, tentando diferentes chaves que a API pode usar.
+    status = str(exp.get("status_name") or exp.get("status_label") or exp.get("status", "desconhecido"))
+    return {"status": status, "modified_at": exp.get("modified_at")}
 
 def get_status(base: str, key: str, verify: bool, exp_id: int) -> str:
     """Busca o status atual de um experimento pelo seu ID."""
-    exp = GET(base, key, verify, f"experiments/{exp_id}")
-    # Retorna o status, tentando diferentes chaves que a API pode usar.
-    return str(exp.get("status_name") or exp.get("status_label") or exp.get("status", "desconhecido"))
+    return get_status_info(base, key, verify, exp_id)["status"]
 
-def export_pdf(base: str, key: str, verify: bool, exp_id: int, *, include_changelog: bool = False) -> bytes:
+def export_pdf_stream(base: str, key: str, verify: bool, exp_id: int, *, include_changelog: bool = False) -> Iterator[bytes]:
     """
-    Exporta um experimento como um arquivo PDF.
+    Exporta um experimento como PDF, devolvendo o arquivo em blocos de `PDF_CHUNK_SIZE` bytes.
 
     Args:
         exp_id: O ID do experimento a ser exportado.
         include_changelog: Se True, o histórico de alterações será incluído no PDF.
 
-    Returns:
-        Os bytes brutos do arquivo PDF gerado.
+    A requisição é feita já na chamada, de modo que erros do eLab são lançados antes
+    de qualquer byte ser enviado ao cliente; apenas a leitura do corpo é adiada.
     """
     # A exportação é feita chamando o endpoint do experimento com o parâmetro 'format=pdf'.
     params = {"format": "pdf"}
     if include_changelog:
         params["changelog"] = "true"
-        
-    response_obj = _req(base, key, verify, "GET", f"experiments/{exp_id}", params=params)
-    return response_obj.content
+
+    response_obj = _req(base, key, verify, "GET", f"experiments/{exp_id}", params=params, stream=True)
+
+    def chunks() -> Iterator[bytes]:
+        with response_obj:
+            yield from response_obj.iter_content(chunk_size=PDF_CHUNK_SIZE)
+
+    return chunks()
@@ -7,24 +7,39 @@ externo eLabFTW, além de interagir com um banco de dados local para
 armazenamento de metadados.
 """
 
-from fastapi import FastAPI, Depends, HTTPException, Header
+from fastapi import FastAPI, Depends, HTTPException, Header, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from anyio import to_thread
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import List
+from typing import Any, List
 from datetime import datetime
+import asyncio
+import hashlib
+import orjson
 
 # Importações locais da aplicação
 from src.backend.database import (
     get_db, init_database, test_connection, register_experiment,
-    register_researcher, get_all_researchers, get_all_experiments
+    register_researcher, get_researchers_summary, get_all_experiments
 )
 from src.backend.models import Researcher
 from src.backend.schemas import (
     ResearcherRequest, ElabCredentials, ExperimentRequest,
-    ResearcherResponse, ExperimentResponse
+    ResearcherResponse, ResearcherListResponse, ExperimentResponse, BootstrapResponse
 )
 import src.backend.elab_service as elab_service
 
+# Número máximo de endpoints síncronos executando ao mesmo tempo.
+THREADPOOL_SIZE = 100
+
+# Pool limitado para chamadas ao eLab disparadas em paralelo dentro de um endpoint.
+ELAB_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="elab")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -32,11 +47,17 @@ async def lifespan(app: FastAPI):
     Executa ações na inicialização e no encerramento.
     """
     print("🚀 Iniciando aplicação e configurando banco de dados...")
+    # Endpoints síncronos rodam no pool de threads do AnyIO (40 por padrão).
+    # Como passam quase todo o tempo esperando o eLab, ampliamos o limite para
+    # que chamadas concorrentes não fiquem enfileiradas.
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
     # Garante que o banco e as tabelas existam ao iniciar.
     init_database()
     test_connection()
     yield
     print("🔌 Encerrando aplicação...")
+    ELAB_EXECUTOR.shutdown(wait=False)
+    elab_service.SESSION.close()
 
 # --- Configuração da Aplicação FastAPI ---
 app = FastAPI(
@@ -44,8 +65,14 @@ app = FastAPI(
     description="API que serve como gateway para o eLabFTW, simplificando operações comuns.",
     version="1.3.0",
     lifespan=lifespan,
+    # Respostas serializadas com `orjson` (em C), mais rápido que o `json` padrão.
+    default_response_class=ORJSONResponse,
 )
 
+# Comprime com gzip as respostas maiores que 1 KB quando o cliente aceita
+# (`Accept-Encoding: gzip`, enviado por padrão pelo `requests` no frontend).
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # --- Dependências (FastAPI) ---
 
 def get_elab_credentials(
@@ -64,6 +91,43 @@ def get_elab_credentials(
     return ElabCredentials(url=elab_url, api_key=elab_api_key)
 
 
+# --- Auxiliares de Resposta ---
+
+def _orjson_default(obj: Any) -> Any:
+    """
+    Converte modelos Pydantic para dicionários com `model_dump()` (modo Python).
+    Campos `datetime` seguem como objetos e são serializados nativamente pelo `orjson`,
+    em C, sem a conversão para string feita pelo `jsonable_encoder`.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Tipo não serializável: {type(obj).__name__}")
+
+def _etag_response(request: Request, payload: Any) -> Response:
+    """
+    Serializa o payload e o devolve com um cabeçalho `ETag` calculado sobre o corpo.
+    Se o cliente já tiver essa versão (`If-None-Match`), responde 304 sem corpo.
+    """
+    body = orjson.dumps(payload, default=_orjson_default)
+    etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+def _researchers_payload(db: Session) -> ResearcherListResponse:
+    """Monta a lista compacta (colunas paralelas, ordenadas por nome) de pesquisadores."""
+    rows = get_researchers_summary(db)
+    return ResearcherListResponse(
+        names=[row.name for row in rows],
+        ids=[row.id for row in rows],
+        elab_item_ids=[row.elab_item_id for row in rows],
+    )
+
+def _experiments_payload(db: Session) -> List[ExperimentResponse]:
+    """Converte os experimentos do banco local para o schema de resposta."""
+    return [ExperimentResponse.model_validate(exp) for exp in get_all_experiments(db)]
+
+
 # --- Endpoints da API ---
 
 @app.post("/test-connection", summary="Testa a Conexão com a API do eLabFTW")
@@ -81,9 +145,20 @@ def initialize_elab(creds: ElabCredentials = Depends(get_elab_credentials)):
     """
     Verifica e, se necessário, cria o "Tipo de Item" para "Pesquisador" no eLabFTW.
     Endpoint útil para a configuração inicial do ambiente.
+
+    Em paralelo, pré-carrega o template de experimento no cache, tirando essa busca
+    do caminho crítico da primeira criação de experimento.
     """
+    template_future = ELAB_EXECUTOR.submit(
+        elab_service.get_template_object_by_title, creds.url, creds.api_key, True, elab_service.TEMPLATE_TITLE_TO_FIND
+    )
     try:
         item_type_id = elab_service.ensure_item_type_researcher(creds.url, creds.api_key, True)
+        try:
+            template_future.result()
+        except Exception as e:
+            # O aquecimento é opcional: a criação de experimentos refaz a busca e reporta o erro.
+            print(f"Alerta: Não foi possível pré-carregar o template: {e}")
         return {
             "item_type_id": item_type_id,
             "message": "O Tipo de Item 'Pesquisador' foi verificado/criado com sucesso."
@@ -91,15 +166,36 @@ def initialize_elab(creds: ElabCredentials = Depends(get_elab_credentials)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao inicializar estruturas no eLab: {e}")
 
-@app.get("/pesquisadores", response_model=List[ResearcherResponse], summary="Lista todos os Pesquisadores")
-def list_researchers(db: Session = Depends(get_db)):
-    """Retorna uma lista de todos os pesquisadores do banco de dados local."""
-    return get_all_researchers(db)
+@app.get("/pesquisadores", response_model=ResearcherListResponse, summary="Lista todos os Pesquisadores")
+def list_researchers(request: Request, db: Session = Depends(get_db)):
+    """
+    Retorna os pesquisadores do banco de dados local em colunas paralelas
+    (`names`, `ids`, `elab_item_ids`), já ordenadas por nome.
+    Os experimentos de cada pesquisador podem ser obtidos em `/experimentos`.
+    """
+    return _etag_response(request, _researchers_payload(db))
 
 @app.get("/experimentos", response_model=List[ExperimentResponse], summary="Lista todas as Solicitações")
-def list_experiments(db: Session = Depends(get_db)):
+def list_experiments(request: Request, db: Session = Depends(get_db)):
     """Retorna uma lista de todos os experimentos (solicitações) do banco local."""
-    return get_all_experiments(db)
+    return _etag_response(request, _experiments_payload(db))
+
+@app.get("/bootstrap", response_model=BootstrapResponse, summary="Carrega os Dados Iniciais do Frontend")
+def bootstrap(
+    request: Request,
+    creds: ElabCredentials = Depends(get_elab_credentials),
+    db: Session = Depends(get_db)
+):
+    """
+    Agrega em uma única chamada o teste de conexão com o eLabFTW e as listas de
+    pesquisadores e experimentos do banco local, poupando idas e voltas ao frontend.
+    """
+    connection = test_elab_connection(creds)
+    return _etag_response(request, BootstrapResponse(
+        message=connection["message"],
+        researchers=_researchers_payload(db),
+        experiments=_experiments_payload(db),
+    ))
 
 @app.post("/pesquisadores", response_model=ResearcherResponse, status_code=201, summary="Cadastra um Novo Pesquisador")
 def create_researcher(
@@ -136,7 +232,7 @@ def create_new_experiment(
     Cria uma nova solicitação (experimento), vinculando-a a um pesquisador.
     """
     try:
-        researcher_obj = db.query(Researcher).filter(Researcher.id == request.researcher_id).first()
+        researcher_obj = db.get(Researcher, request.researcher_id)
         if not researcher_obj:
             raise HTTPException(status_code=404, detail=f"Pesquisador com ID local {request.researcher_id} não encontrado.")
 
@@ -150,19 +246,26 @@ def create_new_experiment(
             db.commit()
 
         # Monta o título e as variáveis para o template do eLab.
-        title = f"[AG:{request.agendamento_id}] Análises {request.display_name} - {datetime.now().date().isoformat()}"
+        # Um único instante para ambos: a data do título e a da coleta não divergem na virada do dia.
+        now = datetime.now()
+        title = f"[AG:{request.agendamento_id}] Análises {request.display_name} - {now.date().isoformat()}"
         vars_dict = {
             "agendamento_id": request.agendamento_id,
-            "data_coleta": datetime.now().isoformat(timespec="minutes"),
+            "data_coleta": now.isoformat(timespec="minutes"),
             "tipo_amostra": request.tipo_amostra,
         }
         
         # Cria o experimento no eLab e o vincula ao item do pesquisador.
         exp_id = elab_service.create_experiment(creds.url, creds.api_key, True, title, vars_dict)
-        elab_service.link_experiment_to_item(creds.url, creds.api_key, True, exp_id, elab_item_id)
-        
-        # Obtém o status inicial.
-        status = elab_service.get_status(creds.url, creds.api_key, True, exp_id)
+
+        # O vínculo e a leitura do status inicial são independentes entre si:
+        # rodam em paralelo, economizando uma ida e volta ao eLab.
+        link_future = ELAB_EXECUTOR.submit(
+            elab_service.link_experiment_to_item, creds.url, creds.api_key, True, exp_id, elab_item_id
+        )
+        status_future = ELAB_EXECUTOR.submit(elab_service.get_status, creds.url, creds.api_key, True, exp_id)
+        link_future.result()
+        status = status_future.result()
         
         # Registra o novo experimento no banco de dados local.
         register_experiment(
@@ -174,25 +277,80 @@ def create_new_experiment(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/experimentos/status", summary="Consulta o Status de Vários Experimentos")
+def get_experiments_status(ids: List[int] = Query(..., description="IDs dos experimentos no eLabFTW."), creds: ElabCredentials = Depends(get_elab_credentials)):
+    """
+    Busca o status de vários experimentos de uma vez. As consultas ao eLabFTW rodam em
+    paralelo no pool limitado `ELAB_EXECUTOR`; falhas individuais viram `null`.
+    """
+    def status_or_none(exp_id: int):
+        try:
+            return elab_service.get_status(creds.url, creds.api_key, True, exp_id)
+        except Exception:
+            return None
+
+    unique_ids = list(dict.fromkeys(ids))
+    return {str(exp_id): status for exp_id, status in zip(unique_ids, ELAB_EXECUTOR.map(status_or_none, unique_ids))}
+
 @app.get("/experimentos/{experiment_id}/status", summary="Consulta o Status de um Experimento")
-def get_experiment_status(experiment_id: int, creds: ElabCredentials = Depends(get_elab_credentials)):
+def get_experiment_status(
+    experiment_id: int,
+    fresh: bool = Query(False, description="Ignora o cache curto de status (use quando `modified_at` versiona outro cache)."),
+    creds: ElabCredentials = Depends(get_elab_credentials),
+):
     """Busca e retorna o status atual de um experimento específico no eLabFTW."""
     try:
-        status = elab_service.get_status(creds.url, creds.api_key, True, experiment_id)
-        return {"status": status}
+        # `__wrapped__` é a função original, sem o cache de STATUS_CACHE_TTL segundos.
+        get_info = elab_service.get_status_info.__wrapped__ if fresh else elab_service.get_status_info
+        info = get_info(creds.url, creds.api_key, True, experiment_id)
+        return {"status": info["status"], "modified_at": info["modified_at"]}
     except Exception as e:
-        if "404" in str(e):
+        if isinstance(e, elab_service.ElabAPIError) and e.status_code == 404:
              raise HTTPException(status_code=404, detail=f"Experimento com ID {experiment_id} não encontrado no eLabFTW.")
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/experimentos/{experiment_id}/events", summary="Acompanha o Status de um Experimento (SSE)")
+async def stream_experiment_status(experiment_id: int, request: Request, creds: ElabCredentials = Depends(get_elab_credentials)):
+    """
+    Mantém uma conexão Server-Sent Events aberta e envia um evento apenas quando o
+    status do experimento muda no eLabFTW. O stream termina ao atingir um status final
+    ou quando o cliente se desconecta.
+
+    O intervalo entre consultas começa em `STATUS_POLL_INTERVAL` segundos e dobra enquanto
+    o status se repete, até `MAX_STATUS_POLL_INTERVAL`; volta ao inicial quando ele muda.
+    """
+    async def event_stream():
+        # A espera é assíncrona: um stream aberto só ocupa uma thread do pool durante a consulta.
+        last_status = None
+        interval = elab_service.STATUS_POLL_INTERVAL
+        while not await request.is_disconnected():
+            status = await run_in_threadpool(elab_service.get_status, creds.url, creds.api_key, True, experiment_id)
+            if status != last_status:
+                last_status = status
+                interval = elab_service.STATUS_POLL_INTERVAL
+                yield b"data: " + orjson.dumps({"status": status}) + b"\n\n"
+                if status in elab_service.TERMINAL_STATUSES:
+                    return
+            else:
+                interval = min(interval * 2, elab_service.MAX_STATUS_POLL_INTERVAL)
+
+            # Aguarda o próximo ciclo em fatias, verificando se o cliente ainda está conectado.
+            for _ in range(interval // elab_service.STATUS_POLL_INTERVAL):
+                await asyncio.sleep(elab_service.STATUS_POLL_INTERVAL)
+                if await request.is_disconnected():
+                    return
+                # Comentário SSE: mantém a conexão viva sem disparar eventos no cliente.
+                yield b": ping\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @app.get("/experimentos/{experiment_id}/pdf", summary="Exporta um Experimento como PDF")
 def get_experiment_pdf(experiment_id: int, include_changelog: bool = False, creds: ElabCredentials = Depends(get_elab_credentials)):
     """Gera e retorna o laudo de um experimento em formato PDF."""
     try:
-        pdf_bytes = elab_service.export_pdf(creds.url, creds.api_key, True, experiment_id, include_changelog=include_changelog)
-        from fastapi.responses import Response
-        # Retorna a resposta com os bytes do PDF e o `media_type` correto.
-        return Response(content=pdf_bytes, media_type="application/pdf")
+        pdf_chunks = elab_service.export_pdf_stream(creds.url, creds.api_key, True, experiment_id, include_changelog=include_changelog)
+        # Repassa o PDF ao cliente à medida que chega do eLab, sem montá-lo inteiro em memória.
+        return StreamingResponse(pdf_chunks, media_type="application/pdf")
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
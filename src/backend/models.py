@@ -54,9 +54,10 @@ class Experiment(Base):
     elab_experiment_id = Column(Integer, nullable=False, unique=True)
     
     # Chave estrangeira que liga o experimento ao seu pesquisador na tabela 'researchers'.
-    researcher_id = Column(Integer, ForeignKey("researchers.id", ondelete="CASCADE"), nullable=False)
+    # Indexada: carregar os experimentos de um pesquisador filtra por esta coluna.
+    researcher_id = Column(Integer, ForeignKey("researchers.id", ondelete="CASCADE"), nullable=False, index=True)
     
-    created_at = Column(DateTime, default=datetime.now())
+    created_at = Column(DateTime, default=datetime.now)
 
     # Define a relação "muitos-para-um", ligando de volta ao pesquisador.
     researcher = relationship("Researcher", back_populates="experiments")
@@ -33,6 +33,21 @@ class ResearcherResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ResearcherListResponse(BaseModel):
+    """
+    Lista compacta de pesquisadores em colunas paralelas, já ordenada por nome.
+    Evita repetir as chaves de cada objeto no JSON e poupa o cliente de reordenar.
+    """
+    names: List[str]
+    ids: List[int]
+    elab_item_ids: List[Optional[int]]
+
+class BootstrapResponse(BaseModel):
+    """Dados iniciais do frontend: resultado do teste de conexão e as listas do banco local."""
+    message: str
+    researchers: ResearcherListResponse
+    experiments: List[ExperimentResponse]
+
 
 # --- Schemas para Requisições ---
 
@@ -1,11 +1,18 @@
 # frontend/app.py (VERSÃO FINAL COM INTERFACE ATUALIZADA)
 import streamlit as st
 import requests
-from typing import Dict, Optional, Any, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import bisect
+from concurrent.futures import ThreadPoolExecutor
+import io
+import itertools
+import orjson
+import threading
+import time
+from typing import Dict, Optional, Any, List, Tuple
 import os
-from dotenv import load_dotenv
-from streamlit_autorefresh import st_autorefresh
-import numpy as np
+from types import MappingProxyType
 
 # ==============================================================================
 # APLICAÇÃO FRONTEND COM STREAMLIT
@@ -20,107 +27,430 @@ import numpy as np
 # Helpers de UI e Configuração
 # =========================
 
-def gradient_bar(height: int = 6, width: int = 1200):
-    left = np.array([252, 76, 76], dtype=np.float32)
-    right = np.array([255, 255, 124], dtype=np.float32)
-    x = np.linspace(0.0, 1.0, width, dtype=np.float32).reshape(1, width, 1)
-    grad = (left * (1 - x) + right * x).astype(np.uint8)
-    bar = np.repeat(grad, height, axis=0)
-    st.image(bar, use_container_width=True, clamp=True)
-
-# Carrega variáveis de ambiente de um arquivo .env
-load_dotenv()
-
-# Busca as configurações da API do .env ou usa valores padrão.
-ELAB_URL = os.getenv("ELAB_URL", "")
-API_KEY = os.getenv("API_KEY", "")
-BACKEND_URL = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
+@st.cache_resource
+def _build_gradient_bar(height: int = 6, width: int = 1200) -> bytes:
+    """
+    Gera a barra em degradê já codificada em PNG, uma única vez por processo.
+    O Streamlit recebe os bytes prontos e não precisa recodificar o array a cada exibição.
+    """
+    # Imports tardios: NumPy e Pillow só são necessários para desenhar a barra.
+    import numpy as np
+    from PIL import Image
+
+    # Interpolação linear inteira: calcula uma única linha (W, 3) em uint32
+    # e a replica na altura com `broadcast_to`, que devolve uma view sem cópia.
+    left = np.array([252, 76, 76], dtype=np.uint32)
+    right = np.array([255, 255, 124], dtype=np.uint32)
+    t = np.arange(width, dtype=np.uint32)[:, None]
+    span = max(width - 1, 1)
+    row = ((left * (width - 1 - t) + right * t) // span).astype(np.uint8)
+    bar = np.broadcast_to(row, (height, width, 3))
+
+    buffer = io.BytesIO()
+    Image.fromarray(np.ascontiguousarray(bar)).save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
 
-# Cabeçalhos da API usados em todas as chamadas
-api_headers = {"elab-url": ELAB_URL, "elab-api-key": API_KEY}
+def gradient_bar(height: int = 6, width: int = 1200):
+    st.image(_build_gradient_bar(height, width), use_container_width=True)
+
+# Quantidade de entradas exibidas por página nos blocos JSON da aba de administração.
+ADMIN_PAGE_SIZE = 50
+
+def json_page(data: Dict[str, Any], key: str):
+    """Exibe em JSON apenas uma página do dicionário, em vez de enviar tudo ao navegador."""
+    total_pages = max(1, -(-len(data) // ADMIN_PAGE_SIZE))
+    page = st.number_input("Página", min_value=1, max_value=total_pages, value=1, step=1, key=key)
+    start = (page - 1) * ADMIN_PAGE_SIZE
+    st.json(dict(itertools.islice(data.items(), start, start + ADMIN_PAGE_SIZE)), expanded=False)
+    st.caption(f"{len(data)} registros · página {page} de {total_pages}")
+
+@st.cache_resource
+def load_settings() -> Dict[str, str]:
+    """Carrega o arquivo .env uma única vez por processo e devolve as configurações da aplicação."""
+    # O .env só é lido se faltar alguma variável; as já exportadas no ambiente têm prioridade.
+    if not all(os.getenv(name) for name in ("ELAB_URL", "API_KEY", "BACKEND_URL")):
+        from dotenv import load_dotenv
+        load_dotenv()
+    # Busca as configurações da API do .env ou usa valores padrão.
+    return {
+        "ELAB_URL": os.getenv("ELAB_URL", ""),
+        "API_KEY": os.getenv("API_KEY", ""),
+        "BACKEND_URL": os.getenv("BACKEND_URL", "http://127.0.0.1:8000"),
+    }
+
+_settings = load_settings()
+ELAB_URL = _settings["ELAB_URL"]
+API_KEY = _settings["API_KEY"]
+BACKEND_URL = _settings["BACKEND_URL"]
+
+@st.cache_resource
+def get_http() -> requests.Session:
+    """
+    Cria uma única sessão HTTP por processo, compartilhada entre reruns e usuários.
+    Os cabeçalhos de credenciais ficam na sessão e o pool mantém as conexões
+    com o backend abertas (keep-alive).
+    """
+    session = requests.Session()
+    session.headers.update({"elab-url": ELAB_URL, "elab-api-key": API_KEY})
+    # Falhas transitórias (conexão recusada/resetada, 502/503/504) são repetidas
+    # com backoff apenas em GET: um POST repetido poderia duplicar cadastros.
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=32, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Sessão HTTP usada em todas as chamadas ao backend
+http = get_http()
+
+# Status a partir dos quais o experimento não muda mais ("Concluída", "Requer reavaliação", "Falhou").
+TERMINAL_STATUSES = frozenset({"2", "3", "4"})
+
+# Rótulo e ícone exibidos para cada status de experimento retornado pelo eLabFTW.
+STATUS_MESSAGES = MappingProxyType({
+    "None": ("Pendente", "🔄"),
+    "1": ("Em andamento", "⏳"),
+    "2": ("Concluída", "✅"),
+    "3": ("Requer reavaliação", "⚠️"),
+    "4": ("Falhou", "❌"),
+})
 
 
 # =========================
 # Estado da Sessão (Session State)
 # =========================
-# Guarda os pesquisadores carregados do banco (Chave: nome, Valor: dict com dados do pesquisador)
-if "researchers_session" not in st.session_state:
-    st.session_state.researchers_session: Dict[str, Dict[str, Any]] = {}
-
-# Guarda os experimentos criados (Chave: ID de Agendamento, Valor: ID do Experimento no eLab)
-if "agendamentos" not in st.session_state:
-    st.session_state.agendamentos: Dict[str, int] = {}
-
-# Armazena temporariamente o último PDF gerado para o botão de download.
-if "pdf_info" not in st.session_state:
-    st.session_state.pdf_info: Dict[str, Any] = {"bytes": None, "name": None}
-
-# Mantém o controle do último ID consultado para evitar recargas indesejadas.
-if "last_consulted_id" not in st.session_state:
-    st.session_state.last_consulted_id: Optional[str] = None
-
-# Flag para controlar o carregamento inicial de dados
-if "data_loaded" not in st.session_state:
-    st.session_state.data_loaded = False
-
-if "initialized_elab" not in st.session_state:
-    st.session_state.initialized_elab = False
+# Valores iniciais de cada chave do session_state. As fábricas garantem objetos
+# novos (e não compartilhados) para cada sessão.
+_SESSION_DEFAULTS = {
+    # Pesquisadores carregados do banco (Chave: nome, Valor: dict com dados do pesquisador)
+    "researchers_session": dict,
+    # Nomes dos pesquisadores já ordenados, mantidos em paralelo a `researchers_session`
+    # para que os selectboxes não precisem reordenar a lista a cada rerun.
+    "researchers_sorted": list,
+    # Experimentos criados (Chave: ID de Agendamento, Valor: ID do Experimento no eLab)
+    "agendamentos": dict,
+    # Último PDF gerado, usado pelo botão de download.
+    "pdf_info": lambda: {"file": None, "name": None},
+    # Último ID consultado, para evitar recargas indesejadas.
+    "last_consulted_id": lambda: None,
+    # Último status conhecido de cada experimento (Chave: ID no eLab). Status finais
+    # não mudam mais, então não precisam ser consultados novamente.
+    "last_status": dict,
+    # Último status (por experimento no eLab) que já motivou uma reexecução da página.
+    "status_reruns": dict,
+    # Flags de carregamento inicial de dados e de inicialização do eLab.
+    "data_loaded": lambda: False,
+    "initialized_elab": lambda: False,
+}
+for _key, _factory in _SESSION_DEFAULTS.items():
+    if _key not in st.session_state:
+        st.session_state[_key] = _factory()
+
+@st.cache_resource
+def _session_store(elab_url: str) -> Dict[str, Any]:
+    """
+    Guarda, por processo, as estruturas já montadas a partir do `/bootstrap` da instância
+    do eLab, em `"snapshot"`: uma tupla (ETag de origem, dados). O dicionário é compartilhado
+    por todas as sessões, então o snapshot nunca é alterado: cada sessão recebe uma cópia.
+    """
+    return {}
+
+def _copy_session_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copia pesquisadores e agendamentos do snapshot para uso exclusivo de uma sessão."""
+    return {
+        # As listas de experimentos também são copiadas: a aba 1 acrescenta itens a elas.
+        "researchers_session": {name: {**info, "experiments": list(info["experiments"])} for name, info in data["researchers_session"].items()},
+        "researchers_sorted": list(data["researchers_sorted"]),
+        "agendamentos": dict(data["agendamentos"]),
+    }
+
+_store = _session_store(ELAB_URL)
 
 # =========================
 # Funções de Comunicação com o Backend
 # =========================
 
+def _json(response: requests.Response) -> Any:
+    """Decodifica o corpo JSON da resposta com `orjson` (parser em C, mais rápido que o `json` padrão)."""
+    return orjson.loads(response.content)
+
+# Limite de caracteres do detalhe de erro exibido ao usuário.
+MAX_ERROR_DETAIL = 2048
+
 def handle_api_error(e: requests.exceptions.RequestException, context: str):
     """Exibe uma mensagem de erro amigável para o usuário em caso de falha na API."""
     error_message = str(e)
-    if e.response is not None:
-        try:
-            error_detail = e.response.json().get("detail", e.response.text)
-            error_message = f"Erro {e.response.status_code}: {error_detail}"
-        except (ValueError, AttributeError):
-            error_message = f"Erro {e.response.status_code}: {e.response.text}"
+    response = e.response
+    if response is not None:
+        # Só decodifica JSON quando o backend declara JSON; páginas de erro em
+        # HTML ou texto vão direto para o texto, truncado em MAX_ERROR_DETAIL.
+        error_detail = None
+        if "json" in response.headers.get("content-type", ""):
+            try:
+                detail = _json(response).get("detail")
+                if detail is not None:
+                    error_detail = str(detail)
+            except (ValueError, AttributeError):
+                pass
+        if error_detail is None:
+            error_detail = response.text
+        error_message = f"Erro {response.status_code}: {error_detail[:MAX_ERROR_DETAIL]}"
     st.error(f"Falha em '{context}': {error_message}")
 
-def api_test_connection(headers: Dict) -> None:
-    response = requests.post(f"{BACKEND_URL}/test-connection", headers=headers)
+@st.cache_resource
+def _etag_store() -> Dict[Tuple[str, str], Tuple[str, Any]]:
+    """Último ETag e payload recebidos para cada (eLab, endpoint), compartilhados entre sessões."""
+    return {}
+
+def _conditional_get(elab_url: str, api_key: str, path: str) -> Any:
+    """
+    GET condicional: envia o último ETag conhecido em `If-None-Match` e, se o
+    backend responder 304 (Not Modified), reaproveita o payload já decodificado.
+    """
+    store = _etag_store()
+    cached = store.get((elab_url, path))
+    headers = {"elab-url": elab_url, "elab-api-key": api_key}
+    if cached:
+        headers["If-None-Match"] = cached[0]
+    response = get_http().get(f"{BACKEND_URL}{path}", headers=headers)
+    if response.status_code == 304 and cached:
+        return cached[1]
     response.raise_for_status()
-    st.success(response.json()["message"])
-
-def api_get_researchers(headers: Dict) -> List[Dict]:
-    response = requests.get(f"{BACKEND_URL}/pesquisadores", headers=headers)
+    data = _json(response)
+    etag = response.headers.get("ETag")
+    if etag:
+        store[(elab_url, path)] = (etag, data)
+    return data
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_bootstrap(elab_url: str, api_key: str) -> Dict[str, Any]:
+    return _conditional_get(elab_url, api_key, "/bootstrap")
+
+def api_bootstrap(session: requests.Session) -> Dict[str, Any]:
+    """Testa a conexão e carrega pesquisadores e experimentos em uma única chamada ao backend."""
+    return _fetch_bootstrap(session.headers["elab-url"], session.headers["elab-api-key"])
+
+def _post_json(session: requests.Session, path: str, payload: Any) -> requests.Response:
+    """POST com o corpo serializado por `orjson`, simétrico a `_json` na leitura."""
+    response = session.post(
+        f"{BACKEND_URL}{path}",
+        data=orjson.dumps(payload),
+        headers={"Content-Type": "application/json"},
+    )
     response.raise_for_status()
-    return response.json()
-
-def api_get_experiments(headers: Dict) -> List[Dict]:
-    response = requests.get(f"{BACKEND_URL}/experimentos", headers=headers)
+    return response
+
+def api_create_researcher(session: requests.Session, name: str) -> Dict:
+    response = _post_json(session, "/pesquisadores", {"name": name})
+    _fetch_bootstrap.clear()  # Os dados iniciais em cache ficaram desatualizados.
+    return _json(response)
+
+# Máximo de cadastros simultâneos no modo em lote (cada um é uma ida ao backend e ao eLab).
+BULK_MAX_WORKERS = 8
+
+def api_create_researchers(session: requests.Session, names: List[str]) -> Tuple[List[Dict], List[Tuple[str, requests.exceptions.RequestException]]]:
+    """
+    Cadastra vários pesquisadores com POSTs paralelos. Devolve os criados e as falhas
+    (nome, exceção); as threads não chamam o Streamlit, quem exibe os erros é a aba.
+    """
+    def create(name: str):
+        try:
+            return _json(_post_json(session, "/pesquisadores", {"name": name})), None
+        except requests.exceptions.RequestException as e:
+            return None, (name, e)
+
+    with ThreadPoolExecutor(max_workers=min(BULK_MAX_WORKERS, len(names))) as executor:
+        results = list(executor.map(create, names))
+    _fetch_bootstrap.clear()  # Uma única invalidação para o lote inteiro.
+    created = [data for data, _ in results if data is not None]
+    failures = [failure for _, failure in results if failure is not None]
+    return created, failures
+
+def api_create_experiment(session: requests.Session, body: Dict) -> Dict:
+    response = _post_json(session, "/experimentos", body)
+    _fetch_bootstrap.clear()  # Os dados iniciais em cache ficaram desatualizados.
+    return _json(response)
+
+def _request_status_info(session: requests.Session, exp_id: int, headers: Optional[Dict[str, str]] = None, fresh: bool = False) -> Dict[str, Any]:
+    """
+    Requisição de status sem APIs do Streamlit, segura para uso em threads.
+    `fresh=True` pede ao backend que ignore o seu cache curto de status.
+    """
+    params = {"fresh": "true"} if fresh else None
+    response = session.get(f"{BACKEND_URL}/experimentos/{exp_id}/status", params=params, headers=headers)
     response.raise_for_status()
-    return response.json()
-
-def api_create_researcher(headers: Dict, name: str) -> Dict:
-    response = requests.post(f"{BACKEND_URL}/pesquisadores", headers=headers, json={"name": name})
+    return _json(response)
+
+def _request_status(session: requests.Session, exp_id: int, headers: Optional[Dict[str, str]] = None) -> str:
+    return _request_status_info(session, exp_id, headers).get('status', 'desconhecido')
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _fetch_status(elab_url: str, api_key: str, exp_id: int) -> str:
+    """Consulta o status; cliques repetidos em até 15s reutilizam a resposta."""
+    headers = {"elab-url": elab_url, "elab-api-key": api_key}
+    return _request_status(get_http(), exp_id, headers)
+
+def api_get_status(session: requests.Session, exp_id: int) -> str:
+    return _fetch_status(session.headers["elab-url"], session.headers["elab-api-key"], exp_id)
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _fetch_all_statuses(elab_url: str, api_key: str, ids: Tuple[int, ...]) -> Dict[int, Optional[str]]:
+    """
+    Consulta vários status numa única requisição; o backend os busca em paralelo.
+    Falhas individuais viram None sem derrubar o lote. Uma falha da requisição inteira
+    é propagada, para não ficar em cache.
+    """
+    if not ids:
+        return {}
+    headers = {"elab-url": elab_url, "elab-api-key": api_key}
+    response = get_http().get(f"{BACKEND_URL}/experimentos/status", params={"ids": list(ids)}, headers=headers)
     response.raise_for_status()
-    return response.json()
-
-def api_create_experiment(headers: Dict, body: Dict) -> Dict:
-    response = requests.post(f"{BACKEND_URL}/experimentos", headers=headers, json=body)
+    statuses = _json(response)
+    return {exp_id: statuses.get(str(exp_id)) for exp_id in ids}
+
+def fetch_all_statuses(session: requests.Session, ids: List[int]) -> Dict[int, Optional[str]]:
+    try:
+        return _fetch_all_statuses(session.headers["elab-url"], session.headers["elab-api-key"], tuple(ids))
+    except requests.exceptions.RequestException:
+        return dict.fromkeys(ids)
+
+# Tamanho dos blocos lidos do backend ao baixar o PDF.
+PDF_CHUNK_SIZE = 64 * 1024
+
+def _download_pdf(session: requests.Session, exp_id: int, include_changelog: bool, headers: Optional[Dict[str, str]] = None) -> io.BytesIO:
+    """
+    Baixa o PDF em blocos diretamente para um buffer, sem manter em paralelo
+    a cópia completa que `response.content` criaria.
+    """
+    params = {"include_changelog": include_changelog}
+    with session.get(f"{BACKEND_URL}/experimentos/{exp_id}/pdf", params=params, headers=headers, stream=True) as response:
+        response.raise_for_status()
+        buffer = io.BytesIO()
+        for chunk in response.iter_content(chunk_size=PDF_CHUNK_SIZE):
+            buffer.write(chunk)
+    buffer.seek(0)
+    return buffer
+
+@st.cache_data(ttl=3600, max_entries=5, show_spinner=False)
+def _fetch_pdf(elab_url: str, api_key: str, exp_id: int, include_changelog: bool, version: str) -> io.BytesIO:
+    """
+    PDF em cache por versão do experimento (`modified_at` no eLab): gerar de novo o
+    laudo de um experimento que não mudou não repete a renderização no servidor.
+    """
+    headers = {"elab-url": elab_url, "elab-api-key": api_key}
+    return _download_pdf(get_http(), exp_id, include_changelog, headers)
+
+def api_get_pdf(session: requests.Session, exp_id: int, include_changelog: bool) -> io.BytesIO:
+    # Leitura sem cache: um `modified_at` atrasado serviria o PDF antigo como se fosse atual.
+    version = _request_status_info(session, exp_id, fresh=True).get("modified_at")
+    if not version:
+        # Sem a data de modificação não há como saber se o PDF em cache está atual.
+        return _download_pdf(session, exp_id, include_changelog)
+    return _fetch_pdf(session.headers["elab-url"], session.headers["elab-api-key"], exp_id, include_changelog, str(version))
+
+@st.cache_resource(show_spinner=False)
+def _cached_initialize(backend_url: str, elab_url: str, api_key: str) -> bool:
+    """
+    A inicialização é idempotente: basta executá-la uma vez por combinação de
+    backend e credenciais. Falhas não ficam em cache, pois a exceção é propagada.
+    """
+    headers = {"elab-url": elab_url, "elab-api-key": api_key}
+    response = get_http().post(f"{backend_url}/initialize", headers=headers)
     response.raise_for_status()
-    return response.json()
+    return True
 
-def api_get_status(headers: Dict, exp_id: int) -> str:
-    response = requests.get(f"{BACKEND_URL}/experimentos/{exp_id}/status", headers=headers)
-    response.raise_for_status()
-    return response.json().get('status', 'desconhecido')
+def api_initialize(session: requests.Session) -> None:
+    _cached_initialize(BACKEND_URL, session.headers["elab-url"], session.headers["elab-api-key"])
 
-def api_get_pdf(headers: Dict, exp_id: int, include_changelog: bool) -> bytes:
-    params = {"include_changelog": include_changelog}
-    response = requests.get(f"{BACKEND_URL}/experimentos/{exp_id}/pdf", headers=headers, params=params)
-    response.raise_for_status()
-    return response.content
+# =========================
+# Acompanhamento de Status (Server-Sent Events)
+# =========================
 
-def api_initialize(headers: Dict) -> None:
-    response = requests.post(f"{BACKEND_URL}/initialize", headers=headers)
-    response.raise_for_status()
-    st.success("Estruturas essenciais verificadas com sucesso no eLabFTW!")
+# Intervalo (em segundos) em que o fragmento de status verifica se chegou um novo status.
+STATUS_CHECK_INTERVAL = 5
+# Uma thread de escuta que o fragmento deixa de ler por este número de verificações é
+# encerrada: o usuário saiu da página ou passou a consultar outro experimento.
+WATCHER_IDLE_CHECKS = 3
+
+@st.cache_resource
+def _status_watchers() -> Dict[str, Any]:
+    """
+    Registro, por processo, das threads que escutam o stream de status do backend,
+    do último status recebido por cada uma e de quando o fragmento o leu pela última vez.
+    """
+    return {"lock": threading.Lock(), "threads": {}, "status": {}, "last_read": {}}
+
+def _watcher_idle(watchers: Dict[str, Any], exp_id: int) -> bool:
+    """Indica se nenhum fragmento lê o status do experimento há `WATCHER_IDLE_CHECKS` verificações."""
+    last_read = watchers["last_read"].get(exp_id, 0.0)
+    return time.monotonic() - last_read > WATCHER_IDLE_CHECKS * STATUS_CHECK_INTERVAL
+
+def _listen_status_events(session: requests.Session, exp_id: int, watchers: Dict[str, Any]) -> None:
+    """
+    Consome o stream SSE do backend, gravando em `watchers["status"]` cada novo status recebido.
+    Fecha a conexão (liberando o stream no backend) quando o watcher fica ocioso.
+    """
+    try:
+        url = f"{BACKEND_URL}/experimentos/{exp_id}/events"
+        with session.get(url, stream=True, timeout=(5, 90)) as response:
+            response.raise_for_status()
+            # Os keep-alives do backend garantem que esta verificação rode periodicamente.
+            for line in response.iter_lines(decode_unicode=True):
+                if _watcher_idle(watchers, exp_id):
+                    break
+                if line and line.startswith("data:"):
+                    watchers["status"][exp_id] = orjson.loads(line[len("data:"):])["status"]
+    except (requests.exceptions.RequestException, ValueError, KeyError):
+        pass  # A conexão é reaberta na próxima verificação do fragmento.
+    finally:
+        with watchers["lock"]:
+            if watchers["threads"].get(exp_id) is threading.current_thread():
+                del watchers["threads"][exp_id]
+            # Um watcher ocioso é descartado por inteiro; status finais ficam registrados
+            # para que o experimento não volte a ser acompanhado.
+            if _watcher_idle(watchers, exp_id) and watchers["status"].get(exp_id) not in TERMINAL_STATUSES:
+                watchers["status"].pop(exp_id, None)
+                watchers["last_read"].pop(exp_id, None)
+
+def watch_status(session: requests.Session, exp_id: int) -> Optional[str]:
+    """
+    Garante que exista uma thread escutando o status do experimento e
+    retorna o último status recebido por ela (ou None, se ainda não chegou nenhum).
+    """
+    watchers = _status_watchers()
+    with watchers["lock"]:
+        watchers["last_read"][exp_id] = time.monotonic()
+        latest = watchers["status"].get(exp_id)
+        thread = watchers["threads"].get(exp_id)
+        if latest not in TERMINAL_STATUSES and (thread is None or not thread.is_alive()):
+            thread = threading.Thread(
+                target=_listen_status_events, args=(session, exp_id, watchers), daemon=True
+            )
+            watchers["threads"][exp_id] = thread
+            thread.start()
+    return latest
+
+@st.fragment(run_every=STATUS_CHECK_INTERVAL)
+def status_listener(exp_id: int, shown_status: str):
+    """
+    Fragmento sem elementos visuais: verifica apenas em memória se o backend
+    enviou um novo status e, somente nesse caso, reexecuta a página inteira.
+    """
+    latest = watch_status(http, exp_id)
+    if latest is not None and latest != shown_status:
+        # Uma única reexecução por novo status: se a página continuar mostrando o antigo
+        # (cache de status de outro worker do backend), não entra em um ciclo de reruns.
+        notified = st.session_state.status_reruns
+        if notified.get(exp_id) != latest:
+            notified[exp_id] = latest
+            _fetch_status.clear()  # Descarta o status em cache, que acabou de ficar desatualizado.
+            st.rerun()
 
 if not st.session_state.initialized_elab:
     if not ELAB_URL or not API_KEY:
@@ -128,7 +458,7 @@ if not st.session_state.initialized_elab:
         st.warning("Defina ELAB_URL e API_KEY no seu .env para inicializar o ambiente.")
     else:
         try:
-            api_initialize(api_headers)
+            api_initialize(http)
             st.session_state.initialized_elab = True
             st.toast("Estruturas essenciais verificadas.", icon="✅")
         except requests.exceptions.RequestException as e:
@@ -152,14 +482,36 @@ if not st.session_state.data_loaded:
     else:
         try:
             with st.spinner("Conectando ao backend e carregando dados do banco..."):
-                api_test_connection(api_headers)
-                researchers_data = api_get_researchers(api_headers)
-                st.session_state.researchers_session = {r["name"]: r for r in researchers_data} #
-                exp_data = api_get_experiments(api_headers)
-                st.session_state.researchers_session = {r["name"]: r for r in researchers_data}
-                exp_data = api_get_experiments(api_headers)
-                st.session_state.agendamentos = {exp["id"]: exp["elab_experiment_id"] for exp in exp_data}
-                st.toast(f"{len(researchers_data)} pesquisadores e {len(exp_data)} solicitações carregadas!", icon="✅")
+                # Sempre passa pelo `_fetch_bootstrap` em cache (ttl + ETag), para que uma
+                # nova sessão enxergue alterações feitas por outras.
+                bootstrap_data = api_bootstrap(http)
+                st.success(bootstrap_data["message"])
+                researchers_data = bootstrap_data["researchers"]
+                exp_data = bootstrap_data["experiments"]
+
+                # Reaproveita as estruturas já montadas se o ETag do /bootstrap não mudou.
+                cached_etag = _etag_store().get((ELAB_URL, "/bootstrap"))
+                version = cached_etag[0] if cached_etag else None
+                snapshot = _store.get("snapshot")
+                if version is None or snapshot is None or snapshot[0] != version:
+                    # Agrupa os experimentos por pesquisador para montar o mapa por nome.
+                    experiments_by_researcher: Dict[int, List[Dict]] = {}
+                    for exp in exp_data:
+                        experiments_by_researcher.setdefault(exp["researcher_id"], []).append(exp)
+
+                    # O backend envia colunas paralelas já ordenadas por nome: não é preciso reordenar.
+                    snapshot = (version, {
+                        "researchers_session": {
+                            name: {"id": rid, "name": name, "elab_item_id": elab_id, "experiments": experiments_by_researcher.get(rid, [])}
+                            for name, rid, elab_id in zip(researchers_data["names"], researchers_data["ids"], researchers_data["elab_item_ids"])
+                        },
+                        "researchers_sorted": list(researchers_data["names"]),
+                        "agendamentos": {exp["id"]: exp["elab_experiment_id"] for exp in exp_data},
+                    })
+                    if version is not None:
+                        _store["snapshot"] = snapshot  # Troca atômica: leitores veem o antigo ou o novo.
+                st.session_state.update(_copy_session_data(snapshot[1]))
+                st.toast(f"{len(researchers_data['names'])} pesquisadores e {len(exp_data)} solicitações carregadas!", icon="✅")
                 st.session_state.data_loaded = True
         except requests.exceptions.RequestException as e:
             handle_api_error(e, "Falha na conexão inicial e carregamento de dados")
@@ -176,6 +528,7 @@ tab1, tab2, tab3 = st.tabs([
 # ABA 1: NOVA SOLICITAÇÃO
 # =========================
 with tab1:
+    ss = st.session_state
     st.header("Registrar Nova Solicitação de Análise")
 
     with st.expander("Cadastrar Novo Pesquisador (se necessário)"):
@@ -187,7 +540,7 @@ with tab1:
                 else:
                     try:
                         with st.spinner(f"Cadastrando '{name.strip()}'..."):
-                            data = api_create_researcher(api_headers, name.strip())
+                            data = api_create_researcher(http, name.strip())
                             
                             # --- INÍCIO DA CORREÇÃO PARA O KEYERROR ---
                             # Garante que a chave 'experiments' exista no dicionário do pesquisador,
@@ -196,20 +549,41 @@ with tab1:
                                 data['experiments'] = []
                             # --- FIM DA CORREÇÃO ---
                             
-                            st.session_state.researchers_session[data["name"]] = data
+                            if data["name"] not in ss.researchers_session:
+                                bisect.insort(ss.researchers_sorted, data["name"])
+                            ss.researchers_session[data["name"]] = data
                             st.success(f"Pesquisador '{data['name']}' cadastrado! (ID Local: {data['id']}, ID eLab: {data['elab_item_id']})")
                     
                     except requests.exceptions.RequestException as e:
                         handle_api_error(e, "Cadastrar Pesquisador")
 
+        with st.form("form_researchers_bulk"):
+            names_text = st.text_area("Cadastro em lote: nomes (um por linha)", placeholder="Profa. Maria Silva\nDr. João Souza")
+            if st.form_submit_button("Cadastrar Todos", use_container_width=True):
+                # Remove linhas vazias e nomes repetidos, preservando a ordem digitada.
+                names = list(dict.fromkeys(n.strip() for n in names_text.splitlines() if n.strip()))
+                if not names:
+                    st.warning("Informe ao menos um nome.")
+                else:
+                    with st.spinner(f"Cadastrando {len(names)} pesquisadores..."):
+                        created, failures = api_create_researchers(http, names)
+                    for data in created:
+                        data.setdefault('experiments', [])
+                        if data["name"] not in ss.researchers_session:
+                            bisect.insort(ss.researchers_sorted, data["name"])
+                        ss.researchers_session[data["name"]] = data
+                    if created:
+                        st.success(f"{len(created)} pesquisador(es) cadastrado(s).")
+                    for failed_name, e in failures:
+                        handle_api_error(e, f"Cadastrar Pesquisador '{failed_name}'")
+
     st.divider()
     
     st.subheader("Preencher Dados da Solicitação")
     with st.form("form_experiment"):
-        researchers_in_session = list(st.session_state.researchers_session.keys()) #
         nome_pesquisador_selecionado = st.selectbox(
             "Pesquisador",
-            options=sorted(researchers_in_session),
+            options=ss.researchers_sorted,
             index=None,
             placeholder="Selecione um pesquisador..."
         )
@@ -225,11 +599,11 @@ with tab1:
                 st.error("Selecione um pesquisador da lista.")
             elif not agendamento_id.strip():
                 st.error("O ID de Referência (Agendamento) é obrigatório.")
-            elif agendamento_id.strip() in st.session_state.agendamentos:
+            elif agendamento_id.strip() in ss.agendamentos:
                 st.error("Este ID de Referência já foi usado. Crie um novo.")
             else:
                 try:
-                    researcher_info = st.session_state.researchers_session[nome_pesquisador_selecionado]
+                    researcher_info = ss.researchers_session[nome_pesquisador_selecionado]
                     local_id = researcher_info["id"]
                     elab_item_id = researcher_info.get("elab_item_id")
 
@@ -241,10 +615,10 @@ with tab1:
                             "display_name": nome_pesquisador_selecionado.strip(),
                             "tipo_amostra": tipo_amostra.strip() or "Não informado",
                         }
-                        data = api_create_experiment(api_headers, json_body)
+                        data = api_create_experiment(http, json_body)
                         
                         # 1. Atualiza a lista geral de agendamentos (como já fazia antes)
-                        st.session_state.agendamentos[agendamento_id.strip()] = data["experiment_id"]
+                        ss.agendamentos[agendamento_id.strip()] = data["experiment_id"]
 
                         # 2. Prepara os dados do novo experimento no formato que o frontend espera
                         new_experiment_data = {
@@ -253,7 +627,7 @@ with tab1:
                         }
 
                         # 3. Adiciona o novo experimento à lista de experimentos do pesquisador na sessão
-                        st.session_state.researchers_session[nome_pesquisador_selecionado]['experiments'].append(new_experiment_data)
+                        ss.researchers_session[nome_pesquisador_selecionado]['experiments'].append(new_experiment_data)
                         
                         st.success(f"Solicitação criada! ID do Experimento: {data['experiment_id']} | Status: {data['status']}")
                         st.info("Acompanhe o status na aba 'Acompanhamento e Laudos'.")
@@ -263,7 +637,10 @@ with tab1:
 # =========================
 # ABA 2: ACOMPANHAMENTO E LAUDOS
 # =========================
-with tab2:
+@st.fragment
+def render_tracking_tab():
+    """Aba de acompanhamento. Como fragmento, consultas e cliques nela não reexecutam as demais abas."""
+    ss = st.session_state
     st.subheader("Acompanhamento e laudo")
     st.caption("Consulte o status e gere o PDF do laudo quando concluído.")
 
@@ -274,29 +651,26 @@ with tab2:
         )
         consultar = st.form_submit_button("Consultar", use_container_width=True)
 
-    if consultar:
-        st.session_state.last_consulted_id = ag_key_input.strip()
-        st.session_state.pdf_info = {"bytes": None, "name": None}
+    # Consultar novamente o mesmo código não descarta o PDF já gerado.
+    if consultar and ag_key_input.strip() != ss.last_consulted_id:
+        ss.last_consulted_id = ag_key_input.strip()
+        ss.pdf_info = {"file": None, "name": None}
 
-    if st.session_state.last_consulted_id:
-        ag_key = st.session_state.last_consulted_id
+    if ss.last_consulted_id:
+        ag_key = ss.last_consulted_id
         if not ag_key:
             st.warning("Informe um código de referência para consultar.")
-        elif ag_key not in st.session_state.agendamentos:
+        elif ag_key not in ss.agendamentos:
             st.error(f"Código de referência '{ag_key}' não foi encontrado nesta sessão.")
         else:
-            exp_id = st.session_state.agendamentos[ag_key]
+            exp_id = ss.agendamentos[ag_key]
             st.success(f"Código de Agendamento: {ag_key}  |  ID do Experimento no eLab: {exp_id}")
             try:
-                status = api_get_status(api_headers, exp_id)
-                status_map = {
-                    "None": ("Pendente", "🔄"),
-                    "1": ("Em andamento", "⏳"),
-                    "2": ("Concluída", "✅"),
-                    "3": ("Requer reavaliação", "⚠️"),
-                    "4": ("Falhou", "❌"),
-                }
-                status_label, status_icon = status_map.get(status, ("Desconhecido", "❓"))
+                status = ss.last_status.get(exp_id)
+                if status not in TERMINAL_STATUSES:
+                    status = api_get_status(http, exp_id)
+                    ss.last_status[exp_id] = status
+                status_label, status_icon = STATUS_MESSAGES.get(status, ("Desconhecido", "❓"))
                 st.metric(label="Status da análise", value=status_label, delta=status_icon)
 
                 if status == "2":  # concluída → oferece o PDF
@@ -305,31 +679,38 @@ with tab2:
                     include_changelog = st.checkbox("Incluir histórico de alterações (changelog)")
                     if st.button("Gerar PDF", type="primary", use_container_width=True):
                         try:
-                            pdf_bytes = api_get_pdf(api_headers, exp_id, include_changelog)
-                            st.session_state.pdf_info["bytes"] = pdf_bytes
-                            st.session_state.pdf_info["name"] = f"laudo_{ag_key}.pdf"
+                            ss.pdf_info["file"] = api_get_pdf(http, exp_id, include_changelog)
+                            ss.pdf_info["name"] = f"laudo_{ag_key}.pdf"
                             st.toast("Laudo gerado.", icon="📄")
+                            _fetch_status.clear()  # A próxima consulta reflete o estado final.
                         except requests.exceptions.RequestException as e:
                             handle_api_error(e, "Gerar PDF")
-                else:
-                    st.info("A página será atualizada automaticamente a cada 30 segundos para refletir mudanças de status.")
-                    st_autorefresh(interval=30 * 1000, key="status_refresh")
+                elif status not in TERMINAL_STATUSES:
+                    st.info("A página será atualizada automaticamente assim que o status mudar no eLabFTW.")
+                    status_listener(exp_id, status)
             except requests.exceptions.RequestException as e:
                 handle_api_error(e, f"Consultar Status (ID: {ag_key})")
 
-    if st.session_state.pdf_info.get("bytes"):
+    if ss.pdf_info.get("file"):
         st.download_button(
             label="⬇️ Baixar laudo",
-            data=st.session_state.pdf_info["bytes"],
-            file_name=st.session_state.pdf_info["name"],
+            data=ss.pdf_info["file"],
+            file_name=ss.pdf_info["name"],
             mime="application/pdf",
             use_container_width=True,
         )
 
+with tab2:
+    render_tracking_tab()
+
 # =========================
 # ABA 3: ADMINISTRAÇÃO
 # =========================
-with tab3:
+@st.fragment
+def render_admin_tab():
+    """Aba de administração. Como fragmento, suas interações não reexecutam as demais abas."""
+    ss = st.session_state
+    data_loaded = ss.data_loaded
     st.header("Administração do Ambiente")
     st.markdown("Visão geral da sessão e do estado da integração.")
     st.divider()
@@ -341,7 +722,7 @@ with tab3:
     with col1:
         st.caption("Backend")
         # Usamos o flag 'data_loaded' para saber se a comunicação inicial funcionou
-        if st.session_state.get("data_loaded"):
+        if data_loaded:
             st.write("✅ Disponível")
         else:
             st.write("❌ Indisponível")
@@ -349,7 +730,7 @@ with tab3:
     with col2:
         st.caption("eLabFTW")
         # Se os dados foram carregados, a conexão com o eLabFTW foi bem-sucedida
-        if st.session_state.get("data_loaded"):
+        if data_loaded:
             st.write("✅ Conectado")
         else:
             st.write("❌ Não Conectado")
@@ -362,6 +743,15 @@ with tab3:
         else:
             st.write("❌ Ausentes")
 
+    if st.button("Forçar nova verificação", key="force_recheck"):
+        # Descarta os resultados em cache e refaz inicialização e carga no próximo ciclo.
+        _cached_initialize.clear()
+        _fetch_bootstrap.clear()
+        _store.clear()
+        ss.initialized_elab = False
+        ss.data_loaded = False
+        st.rerun(scope="app")
+
     st.divider()
     # --- FIM DO NOVO BLOCO ---
 
@@ -369,28 +759,28 @@ with tab3:
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("**Pesquisadores**")
-        st.json(st.session_state.researchers_session, expanded=False)
+        json_page(ss.researchers_session, key="page_researchers")
     with col2:
         st.markdown("**Solicitações (Agendamento -> ID eLab)**")
-        st.json(st.session_state.agendamentos, expanded=False)
+        json_page(ss.agendamentos, key="page_agendamentos")
 
     st.divider()
     
     st.header("Experimentos por Pesquisador")
-    researcher_names = list(st.session_state.researchers_session.keys())
+    researcher_names = ss.researchers_sorted
     
     if not researcher_names:
         st.info("Nenhum pesquisador carregado. Verifique a conexão e o banco de dados.")
     else:
         selected_name = st.selectbox(
             "Selecione um pesquisador para ver suas solicitações",
-            options=sorted(researcher_names),
+            options=researcher_names,
             index=None,
             placeholder="Escolha um pesquisador..."
         )
 
         if selected_name:
-            researcher_data = st.session_state.researchers_session[selected_name]
+            researcher_data = ss.researchers_session[selected_name]
             experiments_list = researcher_data.get('experiments', [])
             
             st.subheader(f"Solicitações de: {selected_name}")
@@ -398,15 +788,26 @@ with tab3:
             if not experiments_list:
                 st.write("Nenhuma solicitação encontrada para este pesquisador.")
             else:
+                statuses = fetch_all_statuses(http, [exp['elab_experiment_id'] for exp in experiments_list])
+
                 for idx, exp in enumerate(experiments_list):
+                    status = statuses.get(exp['elab_experiment_id'])
                     with st.container():
                         st.markdown(f"**Código de Agendamento:** `{exp['id']}`")
                         st.markdown(f"**ID do Experimento no eLab:** `{exp['elab_experiment_id']}`")
+                        if status is None:
+                            st.markdown("**Status:** ❓ Indisponível")
+                        else:
+                            status_label, status_icon = STATUS_MESSAGES.get(status, ("Desconhecido", "❓"))
+                            st.markdown(f"**Status:** {status_icon} {status_label}")
 
                     # Adiciona divisor somente entre os blocos (não no último)
                     if idx < len(experiments_list) - 1:
                         st.write("")
 
+with tab3:
+    render_admin_tab()
+
 st.write("")
 # =========================
 # Rodapé